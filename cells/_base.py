@@ -2,6 +2,8 @@
 
 """
 
+import numpy as np
+
 
 def tolerance_line(x, x1, y2):
     """ Linear tolerance function
@@ -71,3 +73,320 @@ def tolerance_ellipse(x, x1, y2):
         return y2 * (1 - (x - 1) ** 2 / (x1 - 1) ** 2) ** 0.5
     else:
         return -1
+
+
+def tolerance_line_vec(x, x1, y2):
+    """ Linear tolerance function for arrays
+        Works like tolerance_line, but x can be an array
+
+        Parameters
+        ----------
+        x : numpy.ndarray, [0, 1]
+            Current proportions of positive (or negative for off-center
+            cell's type) central inputs
+
+        x1 : float, [0, 1]
+            See tolerance_line
+
+        y2 : float, [0, 1]
+            See tolerance_line
+
+        Returns
+        -------
+        numpy.ndarray of maximal proportions of positive (or negative
+        for off-center cell's type) peripheral inputs, where the
+        response is positive
+
+
+    """
+    if x1 == 1:
+        return np.where(x == 1, y2, -1.0)
+    return np.where(x >= x1, y2 / (1 - x1) * x + y2 / (x1 - 1) * x1, -1.0)
+
+
+def tolerance_ellipse_vec(x, x1, y2):
+    """ Elliptical tolerance function for arrays
+        Works like tolerance_ellipse, but x can be an array
+
+        Parameters
+        ----------
+        x : numpy.ndarray, [0, 1]
+            Current proportions of positive (or negative for off-center
+            cell's type) central inputs
+
+        x1 : float, [0, 1]
+            See tolerance_ellipse
+
+        y2 : float, [0, 1]
+            See tolerance_ellipse
+
+        Returns
+        -------
+        numpy.ndarray of maximal proportions of positive (or negative
+        for off-center cell's type) peripheral inputs, where the
+        response is positive
+
+
+    """
+    if x1 == 1:
+        return np.where(x == 1, y2, -1.0)
+    # negative only where x < x1, those values are dropped anyway
+    d = np.clip(1 - (x - 1) ** 2 / (x1 - 1) ** 2, 0, None)
+    return np.where(x >= x1, y2 * np.sqrt(d), -1.0)
+
+
+def center_surround_tolerance_lut(n_center_inputs,
+                                  center_type,
+                                  center_surround_tolerance,
+                                  center_threshold,
+                                  surround_threshold):
+    """ Lookup table of the tolerance for cells with Center-surround
+        antagonistic receptive field
+
+        Inputs are binary, so the proportion of positive center inputs
+        takes only n_center_inputs + 1 values. The tolerance for each of
+        them is calculated once.
+
+        Parameters
+        ----------
+        n_center_inputs : int
+            The number of inputs related to the center of the receptive
+            field
+
+        center_type : int, {-1, 1}
+            The type of cells' receptive field
+
+            - -1, receptive field with off-center
+
+            - 1, receptive field with on-center
+
+        center_surround_tolerance : {'constant', 'linear', 'elliptical'}
+            The dependence between the proportion of positive center
+            inputs and acceptable proportion of positive surround
+            inputs
+
+        center_threshold : float, [0, 1]
+            Minimal proportion of positive (or negative for off-center
+            cell's type) center inputs, required to be able to response
+            positively
+
+        surround_threshold : float, [0, 1]
+            Maximal proportion of positive (or negative for off-center
+            cell's type) surround inputs, required to be able to response
+            positively
+
+        Returns
+        -------
+        lut : numpy.ndarray, (n_center_inputs + 1, )
+            Maximal proportion of positive (or negative for off-center
+            cell's type) surround inputs, where the response is positive,
+            indexed by the number of positive center inputs
+
+
+    """
+    x = np.arange(n_center_inputs + 1) / n_center_inputs
+    if center_type != 1:
+        x = 1 - x
+
+    if center_surround_tolerance == 'constant':
+        return np.where(x >= center_threshold, surround_threshold, -1.0)
+    elif center_surround_tolerance == 'linear':
+        return tolerance_line_vec(x, center_threshold, surround_threshold)
+    elif center_surround_tolerance == 'elliptical':
+        return tolerance_ellipse_vec(x, center_threshold, surround_threshold)
+
+
+def center_surround_response_table(n_center_inputs,
+                                   n_surround_inputs,
+                                   center_type,
+                                   center_surround_tolerance,
+                                   center_threshold,
+                                   surround_threshold):
+    """ Table of responses of a cell with Center-surround antagonistic
+        receptive field for every possible number of positive center and
+        surround inputs
+
+        The comparison with the tolerance is done here once, so the
+        response of a cell is found from two integer counts without any
+        floating point arithmetic.
+
+        Parameters
+        ----------
+        n_center_inputs : int
+            The number of inputs related to the center of the receptive
+            field
+
+        n_surround_inputs : int
+            The number of inputs related to the surround of the receptive
+            field
+
+        center_type, center_surround_tolerance,
+        center_threshold, surround_threshold
+            See center_surround_tolerance_lut
+
+        Returns
+        -------
+        table : numpy.ndarray, (n_center_inputs + 1, n_surround_inputs + 1),
+                dtype uint8
+            Responses indexed by the numbers of positive center and
+            surround inputs
+
+
+    """
+    tolerance_lut = center_surround_tolerance_lut(n_center_inputs,
+                                                  center_type,
+                                                  center_surround_tolerance,
+                                                  center_threshold,
+                                                  surround_threshold)
+
+    surround_positive_in_share = \
+        np.arange(n_surround_inputs + 1) / n_surround_inputs
+    if center_type != 1:
+        surround_positive_in_share = 1 - surround_positive_in_share
+
+    table = surround_positive_in_share[np.newaxis, :] <= \
+        tolerance_lut[:, np.newaxis]
+    return table.astype(np.uint8)
+
+
+def center_surround_responses(positive_in_codes, response_table, out=None):
+    """ Responses of a group of cells with Center-surround antagonistic
+        receptive field, calculated at once for the whole group
+
+        Parameters
+        ----------
+        positive_in_codes : numpy.ndarray of int
+            The numbers of positive center and surround inputs of each
+            cell, coded as flat indices into response_table:
+            center_count * (n_surround_inputs + 1) + surround_count
+
+        response_table : numpy.ndarray
+            Table from center_surround_response_table
+
+        out : numpy.ndarray, optional, default None
+            Array to store the responses in, same shape as the codes
+
+        Returns
+        -------
+        responses : numpy.ndarray, dtype of response_table
+            Responses of the cells, {0, 1}
+
+
+    """
+    # the codes are in range by construction, mode='clip' saves the
+    # buffering np.take does for out with mode='raise'
+    return np.take(response_table.ravel(), positive_in_codes,
+                   out=out, mode='clip')
+
+
+class CellBase:
+    """ Base class of binary cells
+
+        Keeps the position of a cell and lets it store its response and
+        take the number of iterations from the layer it belongs to.
+
+        Parameters
+        ----------
+        position : tuple, (row, column)
+            The position of the cell in its layer
+
+        n_iter : int, optional, default 0
+            The number of iterations the cell has ran. Ignored if the
+            cell belongs to a layer
+
+        response_buffer : numpy.ndarray, optional, default None
+            Response array of the layer the cell belongs to. If given,
+            the cell's response is stored in it at the cell's position,
+            so the layer can calculate responses of all its cells at once
+
+        layer : object, optional, default None
+            The layer the cell belongs to. If given, the number of
+            iterations is taken from the layer
+
+    """
+
+    __slots__ = (
+        'position', '_layer', '_n_iter', '_response_buffer', '_response'
+    )
+
+    def __init__(self, position, n_iter=0, response_buffer=None, layer=None):
+        self.position = position
+        self._layer = layer
+        self._n_iter = n_iter
+        self._response_buffer = response_buffer
+        # the initial 0 goes to the private field only, never into
+        # response_buffer, which belongs to the layer
+        self._response = 0
+
+    @property
+    def n_iter(self):
+        if self._layer is None:
+            return self._n_iter
+        return self._layer.n_iter
+
+    @n_iter.setter
+    def n_iter(self, value):
+        if self._layer is not None:
+            raise AttributeError("n_iter of a cell belonging to a layer "
+                                 "is the layer's n_iter")
+        self._n_iter = value
+
+    def _count_iteration(self):
+        # the layer counts iterations of its cells itself
+        if self._layer is None:
+            self._n_iter += 1
+
+    @property
+    def response(self):
+        if self._response_buffer is None:
+            return self._response
+        return self._response_buffer[self.position]
+
+    @response.setter
+    def response(self, value):
+        if self._response_buffer is None:
+            self._response = value
+        else:
+            self._response_buffer[self.position] = value
+
+
+class CenterSurroundCellBase(CellBase):
+    """ Base class of binary cells with Center-surround antagonistic
+        receptive field
+
+        The thresholds are the same for all cells of a layer, so a cell
+        belonging to a layer takes them from the layer.
+
+        Parameters
+        ----------
+        position, n_iter, response_buffer, layer
+            See CellBase
+
+        center_threshold : float, [0; 1]
+            Minimal proportion of positive center inputs
+
+        surround_threshold : float, [0; 1]
+            Maximal proportion of positive surround inputs
+
+    """
+
+    __slots__ = ('_center_threshold', '_surround_threshold')
+
+    def __init__(self, position, center_threshold, surround_threshold,
+                 n_iter=0, response_buffer=None, layer=None):
+        super().__init__(position, n_iter, response_buffer, layer)
+        if layer is None:
+            self._center_threshold = center_threshold
+            self._surround_threshold = surround_threshold
+
+    @property
+    def center_threshold(self):
+        if self._layer is None:
+            return self._center_threshold
+        return self._layer.center_threshold
+
+    @property
+    def surround_threshold(self):
+        if self._layer is None:
+            return self._surround_threshold
+        return self._layer.surround_threshold
@@ -2,13 +2,17 @@
 
 """
 
-import numpy as np
+from operator import attrgetter
 
 
-from ._base import tolerance_line, tolerance_ellipse
+from ._base import tolerance_line, tolerance_ellipse, \
+    CenterSurroundCellBase
 
 
-class GanglionBinaryCell:
+_get_response = attrgetter('response')
+
+
+class GanglionBinaryCell(CenterSurroundCellBase):
     """ Binary ganglion cell class
 
         Parameters
@@ -60,6 +64,15 @@ class GanglionBinaryCell:
         n_iter : int, optional, default 0
             The number of iterations the cell has ran
 
+        response_buffer : numpy.ndarray, optional, default None
+            Response array of the layer the cell belongs to. If given,
+            the cell's response is stored in it at the cell's position,
+            so the layer can calculate responses of all its cells at once
+
+        layer : object, optional, default None
+            The layer the cell belongs to. If given, the number of
+            iterations and the thresholds are taken from the layer
+
         Attributes
         ----------
         position: tuple, (row, column)
@@ -75,6 +88,12 @@ class GanglionBinaryCell:
 
             - 1, receptive field with on-center
 
+        center_threshold : float, [0; 1]
+            Minimal proportion of positive center inputs
+
+        surround_threshold : float, [0; 1]
+            Maximal proportion of positive surround inputs
+
         response : int, {0, 1}
             Current cell's response
 
@@ -83,6 +102,12 @@ class GanglionBinaryCell:
 
     """
 
+    __slots__ = (
+        '_center_input', '_surround_input', 'center_type',
+        '_center_surround_tolerance', '_calculate_response',
+        '_n_center_inputs', '_n_surround_inputs'
+    )
+
     def __init__(self, position,
                  center_input,
                  surround_input,
@@ -90,67 +115,83 @@ class GanglionBinaryCell:
                  center_surround_tolerance='linear',
                  center_threshold=0.8,
                  surround_threshold=0.2,
-                 n_iter=0):
+                 n_iter=0,
+                 response_buffer=None,
+                 layer=None):
 
-        self.position = position
-        self.n_iter = n_iter
+        super().__init__(position, center_threshold, surround_threshold,
+                         n_iter, response_buffer, layer)
         self._center_input = center_input
         self._surround_input = surround_input
+        # the fan-in doesn't change either, so don't take len() every tick
+        self._n_center_inputs = len(center_input)
+        self._n_surround_inputs = len(surround_input)
         self.center_type = center_type
         self._center_surround_tolerance = center_surround_tolerance
-        self._center_threshold = center_threshold
-        self._surround_threshold = surround_threshold
-        self.response = 0
-
-    def _calculate_response(self, center_inputs, surround_inputs):
-
-        if self.center_type == 1:
-            center_positive_in_share = np.mean(center_inputs)
-            surround_positive_in_share = np.mean(surround_inputs)
-        else:
-            center_positive_in_share = 1 - np.mean(center_inputs)
-            surround_positive_in_share = 1 - np.mean(surround_inputs)
-
-        if self._center_surround_tolerance == 'constant':
-            if (center_positive_in_share >= self._center_threshold) and \
-                    (surround_positive_in_share <= self._surround_threshold):
-
-                response = 1
-            else:
-                response = 0
-
-        elif self._center_surround_tolerance == 'linear':
-            if surround_positive_in_share <= \
-                    tolerance_line(center_positive_in_share,
-                                   self._center_threshold,
-                                   self._surround_threshold
-                                   ):
-                response = 1
-            else:
-                response = 0
-
-        elif self._center_surround_tolerance == 'elliptical':
-            if surround_positive_in_share <= \
-                    tolerance_ellipse(center_positive_in_share,
-                                      self._center_threshold,
-                                      self._surround_threshold
-                                      ):
-                response = 1
-            else:
-                response = 0
-
-        return response
+        # the tolerance doesn't change, so choose the calculation once
+        self._calculate_response = {
+            'constant': self._calculate_response_constant,
+            'linear': self._calculate_response_linear,
+            'elliptical': self._calculate_response_elliptical
+        }[center_surround_tolerance]
+
+    def _positive_in_shares(self, center_positive_in, surround_positive_in):
+
+        center_positive_in_share = center_positive_in / self._n_center_inputs
+        surround_positive_in_share = \
+            surround_positive_in / self._n_surround_inputs
+
+        if self.center_type != 1:
+            center_positive_in_share = 1 - center_positive_in_share
+            surround_positive_in_share = 1 - surround_positive_in_share
+
+        return center_positive_in_share, surround_positive_in_share
+
+    def _calculate_response_constant(self, center_positive_in,
+                                     surround_positive_in):
+
+        center_positive_in_share, surround_positive_in_share = \
+            self._positive_in_shares(center_positive_in, surround_positive_in)
+
+        if (center_positive_in_share >= self.center_threshold) and \
+                (surround_positive_in_share <= self.surround_threshold):
+            return 1
+        return 0
+
+    def _calculate_response_linear(self, center_positive_in,
+                                   surround_positive_in):
+
+        center_positive_in_share, surround_positive_in_share = \
+            self._positive_in_shares(center_positive_in, surround_positive_in)
+
+        if surround_positive_in_share <= \
+                tolerance_line(center_positive_in_share,
+                               self.center_threshold,
+                               self.surround_threshold
+                               ):
+            return 1
+        return 0
+
+    def _calculate_response_elliptical(self, center_positive_in,
+                                       surround_positive_in):
+
+        center_positive_in_share, surround_positive_in_share = \
+            self._positive_in_shares(center_positive_in, surround_positive_in)
+
+        if surround_positive_in_share <= \
+                tolerance_ellipse(center_positive_in_share,
+                                  self.center_threshold,
+                                  self.surround_threshold
+                                  ):
+            return 1
+        return 0
 
     def run(self):
         """ Perform one iteration
 
         """
-        center_inputs = [cell.response for cell in self._center_input]
-
-        surround_inputs = [cell.response for cell in self._surround_input]
-
         self.response = self._calculate_response(
-            center_inputs,
-            surround_inputs
+            sum(map(_get_response, self._center_input)),
+            sum(map(_get_response, self._surround_input))
         )
-        self.n_iter += 1
+        self._count_iteration()
@@ -2,8 +2,10 @@
 
 """
 
+from ._base import CellBase
 
-class RodBinaryCell:
+
+class RodBinaryCell(CellBase):
     """ Binary rod cell class
 
         Parameters
@@ -14,6 +16,14 @@ class RodBinaryCell:
         n_iter : int, optional, default 0
             The number of iterations the cell has ran
 
+        response_buffer : numpy.ndarray, optional, default None
+            Response array of the layer the cell belongs to. If given,
+            the cell's response is stored in it at the cell's position
+
+        layer : object, optional, default None
+            The layer the cell belongs to. If given, the number of
+            iterations is taken from the layer
+
         Attributes
         ----------
         position: tuple, (row, column)
@@ -31,10 +41,7 @@ class RodBinaryCell:
 
     """
 
-    def __init__(self, position, n_iter=0):
-        self.position = position
-        self.n_iter = n_iter
-        self.response = 0
+    __slots__ = ()
 
     def run(self, input_):
         """ Perform one iteration
@@ -47,4 +54,4 @@ class RodBinaryCell:
         """
 
         self.response = input_[self.position]
-        self.n_iter += 1
+        self._count_iteration()
@@ -6,10 +6,19 @@
 import numpy as np
 
 
-from ._base import tolerance_line, tolerance_ellipse
+from ._base import tolerance_line, tolerance_ellipse, CellBase
 
 
-class SimplePVCBinaryCell:
+def _gather_responses(cells, buffer):
+    """ Copy responses of the cells into the preallocated buffer
+
+    """
+    for i, cell in enumerate(cells):
+        buffer[i] = cell.response
+    return buffer
+
+
+class SimplePVCBinaryCell(CellBase):
     """ Binary simple primary virtual cortex's cell class
 
     Parameters
@@ -66,6 +75,15 @@ class SimplePVCBinaryCell:
     n_iter : int, optional, default 0
         The number of iterations the cell has ran
 
+    response_buffer : numpy.ndarray, optional, default None
+        Response array of the layer the cell belongs to. If given,
+        the cell's response is stored in it at the cell's position,
+        so the layer can calculate responses of all its cells at once
+
+    layer : object, optional, default None
+        The layer the cell belongs to. If given, the number of
+        iterations is taken from the layer
+
     Attributes
     ----------
 
@@ -96,6 +114,12 @@ class SimplePVCBinaryCell:
 
     """
 
+    __slots__ = (
+        'input_sublayer_type', '_on_region_input', '_off_region_input',
+        '_regions_tolerance', '_calculate_response', '_on_region_threshold',
+        '_off_region_threshold', '_on_region_buffer', '_off_region_buffer'
+    )
+
     def __init__(self, position,
                  input_sublayer_type,
                  on_region_input,
@@ -103,64 +127,103 @@ class SimplePVCBinaryCell:
                  regions_tolerance='constant',
                  on_region_threshold=1.0,
                  off_region_threshold=0.0,
-                 n_iter=0
+                 n_iter=0,
+                 response_buffer=None,
+                 layer=None
                  ):
-        self.position = position
-        self.n_iter = n_iter
+        super().__init__(position, n_iter, response_buffer, layer)
         self.input_sublayer_type = input_sublayer_type
         self._on_region_input = on_region_input
         self._off_region_input = off_region_input
         self._regions_tolerance = regions_tolerance
+        # the tolerance doesn't change, so choose the calculation once
+        self._calculate_response = {
+            'constant': self._calculate_response_constant,
+            'linear': self._calculate_response_linear,
+            'elliptical': self._calculate_response_elliptical
+        }[regions_tolerance]
         self._on_region_threshold = on_region_threshold
         self._off_region_threshold = off_region_threshold
-        self.response = 0
-        
-    def _calculate_response(self, on_region_inputs, off_region_inputs):
-
-        on_region_positive_in_share = np.mean(on_region_inputs)
-        off_region_positive_in_share = np.mean(off_region_inputs)
-
-        if self._regions_tolerance == 'constant':
-            if (on_region_positive_in_share >= self._on_region_threshold) and \
-               (off_region_positive_in_share <= self._off_region_threshold):
-
-                response = 1
-            else:
-                response = 0
-
-        elif self._regions_tolerance == 'linear':
-            if off_region_positive_in_share <= \
-                    tolerance_line(on_region_positive_in_share,
-                                   self._on_region_threshold,
-                                   self._off_region_threshold
-                                   ):
-                response = 1
-            else:
-                response = 0
-
-        elif self._regions_tolerance == 'elliptical':
-            if off_region_positive_in_share <= \
-                    tolerance_ellipse(on_region_positive_in_share,
-                                      self._on_region_threshold,
-                                      self._off_region_threshold
-                                      ):
-                response = 1
-            else:
-                response = 0
-
-        return response
+        # the buffers are needed only if the cell runs by itself,
+        # so they are allocated on the first run
+        self._on_region_buffer = None
+        self._off_region_buffer = None
+
+    def _positive_in_shares(self, on_region_inputs, off_region_inputs):
+
+        # inputs are binary, so counting non-zeros gives the number of
+        # positive ones without summing in a wider type
+        on_region_positive_in_share = \
+            np.count_nonzero(on_region_inputs) / on_region_inputs.size
+        off_region_positive_in_share = \
+            np.count_nonzero(off_region_inputs) / off_region_inputs.size
+
+        return on_region_positive_in_share, off_region_positive_in_share
+
+    def _calculate_response_constant(self, on_region_inputs,
+                                     off_region_inputs):
+
+        on_region_positive_in_share, off_region_positive_in_share = \
+            self._positive_in_shares(on_region_inputs, off_region_inputs)
+
+        if (on_region_positive_in_share >= self._on_region_threshold) and \
+                (off_region_positive_in_share <= self._off_region_threshold):
+            return 1
+        return 0
+
+    def _calculate_response_linear(self, on_region_inputs, off_region_inputs):
+
+        on_region_positive_in_share, off_region_positive_in_share = \
+            self._positive_in_shares(on_region_inputs, off_region_inputs)
+
+        if off_region_positive_in_share <= \
+                tolerance_line(on_region_positive_in_share,
+                               self._on_region_threshold,
+                               self._off_region_threshold
+                               ):
+            return 1
+        return 0
+
+    def _calculate_response_elliptical(self, on_region_inputs,
+                                       off_region_inputs):
+
+        on_region_positive_in_share, off_region_positive_in_share = \
+            self._positive_in_shares(on_region_inputs, off_region_inputs)
+
+        if off_region_positive_in_share <= \
+                tolerance_ellipse(on_region_positive_in_share,
+                                  self._on_region_threshold,
+                                  self._off_region_threshold
+                                  ):
+            return 1
+        return 0
+
+    def _allocate_buffers(self):
+        if self.input_sublayer_type == 'both':
+            self._on_region_buffer = [np.empty(len(cells), dtype=np.uint8)
+                                      for cells in self._on_region_input]
+            self._off_region_buffer = [np.empty(len(cells), dtype=np.uint8)
+                                       for cells in self._off_region_input]
+        else:
+            self._on_region_buffer = np.empty(len(self._on_region_input),
+                                              dtype=np.uint8)
+            self._off_region_buffer = np.empty(len(self._off_region_input),
+                                               dtype=np.uint8)
 
     def run(self):
         """ Perform one iteration
 
         """
 
+        if self._on_region_buffer is None:
+            self._allocate_buffers()
+
         if (self.input_sublayer_type == 'on-center') or \
            (self.input_sublayer_type == 'off-center'):
-            on_region_inputs = \
-                [cell.response for cell in self._on_region_input]
-            off_region_inputs = \
-                [cell.response for cell in self._off_region_input]
+            on_region_inputs = _gather_responses(self._on_region_input,
+                                                 self._on_region_buffer)
+            off_region_inputs = _gather_responses(self._off_region_input,
+                                                  self._off_region_buffer)
 
             self.response = self._calculate_response(
                 on_region_inputs,
@@ -169,15 +232,23 @@ class SimplePVCBinaryCell:
 
         elif self.input_sublayer_type == 'both':
 
-            on_region_inputs_1 = \
-                [cell.response for cell in self._on_region_input[0]]
-            off_region_inputs_1 = \
-                [cell.response for cell in self._off_region_input[0]]
+            on_region_inputs_1 = _gather_responses(
+                self._on_region_input[0],
+                self._on_region_buffer[0]
+            )
+            off_region_inputs_1 = _gather_responses(
+                self._off_region_input[0],
+                self._off_region_buffer[0]
+            )
 
-            on_region_inputs_2 = \
-                [cell.response for cell in self._on_region_input[1]]
-            off_region_inputs_2 = \
-                [cell.response for cell in self._off_region_input[1]]
+            on_region_inputs_2 = _gather_responses(
+                self._on_region_input[1],
+                self._on_region_buffer[1]
+            )
+            off_region_inputs_2 = _gather_responses(
+                self._off_region_input[1],
+                self._off_region_buffer[1]
+            )
 
             response_1 = self._calculate_response(
                 on_region_inputs_1,
@@ -190,10 +261,10 @@ class SimplePVCBinaryCell:
 
             self.response = response_1 * response_2
 
-        self.n_iter += 1
+        self._count_iteration()
 
 
-class SimplePVCBinaryCell2:
+class SimplePVCBinaryCell2(CellBase):
     """ Binary simple primary virtual cortex's cell class
 
     Parameters
@@ -239,6 +310,15 @@ class SimplePVCBinaryCell2:
     n_iter : int, optional, default 0
         The number of iterations the cell has ran
 
+    response_buffer : numpy.ndarray, optional, default None
+        Response array of the layer the cell belongs to. If given,
+        the cell's response is stored in it at the cell's position,
+        so the layer can calculate responses of all its cells at once
+
+    layer : object, optional, default None
+        The layer the cell belongs to. If given, the number of
+        iterations is taken from the layer
+
     Attributes
     ----------
 
@@ -256,71 +336,110 @@ class SimplePVCBinaryCell2:
 
     """
 
+    __slots__ = (
+        '_on_region_input', '_off_region_input', '_regions_tolerance',
+        '_calculate_response', '_on_region_threshold',
+        '_off_region_threshold', '_on_region_buffer', '_off_region_buffer'
+    )
+
     def __init__(self, position,
                  on_region_input,
                  off_region_input,
                  regions_tolerance='constant',
                  on_region_threshold=1.0,
                  off_region_threshold=0.0,
-                 n_iter=0
+                 n_iter=0,
+                 response_buffer=None,
+                 layer=None
                  ):
-        self.position = position
-        self.n_iter = n_iter
+        super().__init__(position, n_iter, response_buffer, layer)
         self._on_region_input = on_region_input
         self._off_region_input = off_region_input
         self._regions_tolerance = regions_tolerance
+        # the tolerance doesn't change, so choose the calculation once
+        self._calculate_response = {
+            'constant': self._calculate_response_constant,
+            'linear': self._calculate_response_linear,
+            'elliptical': self._calculate_response_elliptical
+        }[regions_tolerance]
         self._on_region_threshold = on_region_threshold
         self._off_region_threshold = off_region_threshold
-        self.response = 0
-
-    def _calculate_response(self, on_region_inputs, off_region_inputs):
-
-        on_region_positive_in_share = np.mean(on_region_inputs)
-        off_region_positive_in_share = np.mean(off_region_inputs)
-
-        if self._regions_tolerance == 'constant':
-            if (on_region_positive_in_share >= self._on_region_threshold) and \
-                    (off_region_positive_in_share <= self._off_region_threshold):
-
-                response = 1
-            else:
-                response = 0
-
-        elif self._regions_tolerance == 'linear':
-            if off_region_positive_in_share <= \
-                    tolerance_line(on_region_positive_in_share,
-                                   self._on_region_threshold,
-                                   self._off_region_threshold
-                                   ):
-                response = 1
-            else:
-                response = 0
-
-        elif self._regions_tolerance == 'elliptical':
-            if off_region_positive_in_share <= \
-                    tolerance_ellipse(on_region_positive_in_share,
-                                      self._on_region_threshold,
-                                      self._off_region_threshold
-                                      ):
-                response = 1
-            else:
-                response = 0
-
-        return response
+        # the buffers are needed only if the cell runs by itself,
+        # so they are allocated on the first run
+        self._on_region_buffer = None
+        self._off_region_buffer = None
+
+    def _positive_in_shares(self, on_region_inputs, off_region_inputs):
+
+        # inputs are binary, so counting non-zeros gives the number of
+        # positive ones without summing in a wider type
+        on_region_positive_in_share = \
+            np.count_nonzero(on_region_inputs) / on_region_inputs.size
+        off_region_positive_in_share = \
+            np.count_nonzero(off_region_inputs) / off_region_inputs.size
+
+        return on_region_positive_in_share, off_region_positive_in_share
+
+    def _calculate_response_constant(self, on_region_inputs,
+                                     off_region_inputs):
+
+        on_region_positive_in_share, off_region_positive_in_share = \
+            self._positive_in_shares(on_region_inputs, off_region_inputs)
+
+        if (on_region_positive_in_share >= self._on_region_threshold) and \
+                (off_region_positive_in_share <= self._off_region_threshold):
+            return 1
+        return 0
+
+    def _calculate_response_linear(self, on_region_inputs, off_region_inputs):
+
+        on_region_positive_in_share, off_region_positive_in_share = \
+            self._positive_in_shares(on_region_inputs, off_region_inputs)
+
+        if off_region_positive_in_share <= \
+                tolerance_line(on_region_positive_in_share,
+                               self._on_region_threshold,
+                               self._off_region_threshold
+                               ):
+            return 1
+        return 0
+
+    def _calculate_response_elliptical(self, on_region_inputs,
+                                       off_region_inputs):
+
+        on_region_positive_in_share, off_region_positive_in_share = \
+            self._positive_in_shares(on_region_inputs, off_region_inputs)
+
+        if off_region_positive_in_share <= \
+                tolerance_ellipse(on_region_positive_in_share,
+                                  self._on_region_threshold,
+                                  self._off_region_threshold
+                                  ):
+            return 1
+        return 0
+
+    def _allocate_buffers(self):
+        self._on_region_buffer = np.empty(len(self._on_region_input),
+                                          dtype=np.uint8)
+        self._off_region_buffer = np.empty(len(self._off_region_input),
+                                           dtype=np.uint8)
 
     def run(self):
         """ Perform one iteration
 
         """
 
-        on_region_inputs = \
-            [cell.response for cell in self._on_region_input]
-        off_region_inputs = \
-            [cell.response for cell in self._off_region_input]
+        if self._on_region_buffer is None:
+            self._allocate_buffers()
+
+        on_region_inputs = _gather_responses(self._on_region_input,
+                                             self._on_region_buffer)
+        off_region_inputs = _gather_responses(self._off_region_input,
+                                              self._off_region_buffer)
 
         self.response = self._calculate_response(
             on_region_inputs,
             off_region_inputs
         )
 
-        self.n_iter += 1
\ No newline at end of file
+        self._count_iteration()
\ No newline at end of file
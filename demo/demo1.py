@@ -101,20 +101,20 @@ if __name__ == '__main__':
     cv2.moveWindow('Mechanical Eye', MECH_EYE_WIN_X, MECH_EYE_WIN_Y)
 
     # frame
-    ret, frame_img = cv2.threshold(mech_eye.frame, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
+    frame_img = mech_eye.frame * np.uint8(255)
     frame_img = cv2.resize(frame_img, dsize=(0, 0), fx=11, fy=11, interpolation=cv2.INTER_NEAREST)
     cv2.imshow('Frame', frame_img)
     cv2.moveWindow('Frame', FRAME_WIN_X, FRAME_WIN_Y)
 
     # ganglions' response
-    ret, gangl_img = cv2.threshold(ganglions.response, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
+    gangl_img = ganglions.response * np.uint8(255)
     gangl_img = cv2.resize(gangl_img, dsize=(0, 0), fx=19, fy=19, interpolation=cv2.INTER_NEAREST)
     cv2.imshow('Ganglion', gangl_img)
     cv2.moveWindow('Ganglion', GANGL_WIN_X, GANGL_WIN_Y)
 
     # simple pvcs' response
     for type_ in SIMPLE_PVC_TYPES:
-        ret, simple_pvcs_img = cv2.threshold(simple_pvcs.response[type_], thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
+        simple_pvcs_img = simple_pvcs.response[type_] * np.uint8(255)
         simple_pvcs_img = cv2.resize(simple_pvcs_img, dsize=(0, 0), fx=40, fy=40,
                                      interpolation=cv2.INTER_NEAREST)
         cv2.imshow(f'{type_}', simple_pvcs_img)
@@ -129,7 +129,7 @@ if __name__ == '__main__':
             cv2.moveWindow(F'{type_}', PVC_RIGHT_WIN_X, PVC_RIGHT_WIN_Y)
 
     # borders map
-    ret, borders_map_img = cv2.threshold(borders_map.map, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
+    borders_map_img = borders_map.map * np.uint8(255)
     borders_map_img = cv2.resize(borders_map_img, dsize=(0, 0), fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
     cv2.imshow('Borders map', borders_map_img)
     cv2.moveWindow('Borders map', BORDERS_WIN_X, BORDERS_WIN_Y)
@@ -157,21 +157,20 @@ if __name__ == '__main__':
         cv2.moveWindow('Mechanical_Eye', MECH_EYE_WIN_X, MECH_EYE_WIN_Y)
 
         # frame
-        ret, frame_img = cv2.threshold(mech_eye.frame, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
+        frame_img = mech_eye.frame * np.uint8(255)
         frame_img = cv2.resize(frame_img, dsize=(0, 0), fx=11, fy=11, interpolation=cv2.INTER_NEAREST)
         cv2.imshow('Frame', frame_img)
         cv2.moveWindow('Frame', FRAME_WIN_X, FRAME_WIN_Y)
 
         # ganglions' response
-        ret, gangl_img = cv2.threshold(ganglions.response, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
+        gangl_img = ganglions.response * np.uint8(255)
         gangl_img = cv2.resize(gangl_img, dsize=(0, 0), fx=19, fy=19, interpolation=cv2.INTER_NEAREST)
         cv2.imshow('Ganglion', gangl_img)
         cv2.moveWindow('Ganglion', GANGL_WIN_X, GANGL_WIN_Y)
 
         # simple pvcs' response
         for type_ in SIMPLE_PVC_TYPES:
-            ret, simple_pvcs_img = cv2.threshold(simple_pvcs.response[type_], thresh=0.5, maxval=255,
-                                                 type=cv2.THRESH_BINARY)
+            simple_pvcs_img = simple_pvcs.response[type_] * np.uint8(255)
             simple_pvcs_img = cv2.resize(simple_pvcs_img, dsize=(0, 0), fx=40, fy=40,
                                          interpolation=cv2.INTER_NEAREST)
             cv2.imshow(f'{type_}', simple_pvcs_img)
@@ -186,7 +185,7 @@ if __name__ == '__main__':
                 cv2.moveWindow(F'{type_}', PVC_RIGHT_WIN_X, PVC_RIGHT_WIN_Y)
 
         # borders map
-        ret, borders_map_img = cv2.threshold(borders_map.map, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
+        borders_map_img = borders_map.map * np.uint8(255)
         borders_map_img = cv2.resize(borders_map_img, dsize=(0, 0), fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
         cv2.imshow('Borders map', borders_map_img)
         cv2.moveWindow('Borders map', BORDERS_WIN_X, BORDERS_WIN_Y)
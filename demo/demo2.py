@@ -54,6 +54,44 @@ class BordersMap:
             self.map[center_pos] = 1
 
 
+class BinaryImageWindow:
+    """ Window showing binary image scaled up by integer factor
+
+        The scaled image is kept between calls, each pixel is just
+        repeated scale times in both directions. Only the bounding box
+        of pixels changed since the last call is redrawn, and the window
+        isn't updated at all if nothing has changed.
+
+    """
+    def __init__(self, name, shape, scale):
+        self.name = name
+        self.img = np.zeros((shape[0] * scale, shape[1] * scale),
+                            dtype=np.uint8)
+        self._blocks = self.img.reshape(shape[0], scale, shape[1], scale)
+        self._shown = None
+
+    def show(self, binary_img):
+        binary_img = binary_img > 0.5
+
+        if self._shown is None:
+            self._shown = binary_img
+            self._blocks[...] = \
+                binary_img[:, np.newaxis, :, np.newaxis] * np.uint8(255)
+            cv2.imshow(self.name, self.img)
+            return
+
+        rows, cols = np.nonzero(binary_img != self._shown)
+        if rows.size == 0:
+            return
+
+        changed = (slice(rows.min(), rows.max() + 1),
+                   slice(cols.min(), cols.max() + 1))
+        self._blocks[changed[0], :, changed[1], :] = \
+            binary_img[changed][:, np.newaxis, :, np.newaxis] * np.uint8(255)
+        self._shown = binary_img
+        cv2.imshow(self.name, self.img)
+
+
 class MovingDecisions:
     """
 
@@ -128,6 +166,15 @@ if __name__ == '__main__':
     borders_map = BordersMap(mech_eye, ganglions)
     moving_decisions = MovingDecisions()
 
+    frame_win = BinaryImageWindow('Frame', mech_eye.frame.shape, 11)
+    gangl_win = BinaryImageWindow('Ganglion', ganglions.shape, 19)
+    simple_pvcs_wins = {
+        type_: BinaryImageWindow(f'{type_}', simple_pvcs.shape, 40)
+        for type_ in SIMPLE_PVC_TYPES
+    }
+    borders_map_win = BinaryImageWindow('Borders map', borders_map.map.shape,
+                                        2)
+
     # visualise initial state
 
     # mech eye
@@ -137,23 +184,16 @@ if __name__ == '__main__':
     cv2.moveWindow('Mechanical Eye', MECH_EYE_WIN_X, MECH_EYE_WIN_Y)
 
     # frame
-    ret, frame_img = cv2.threshold(mech_eye.frame, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
-    frame_img = cv2.resize(frame_img, dsize=(0, 0), fx=11, fy=11, interpolation=cv2.INTER_NEAREST)
-    cv2.imshow('Frame', frame_img)
+    frame_win.show(mech_eye.frame)
     cv2.moveWindow('Frame', FRAME_WIN_X, FRAME_WIN_Y)
 
     # ganglions' response
-    ret, gangl_img = cv2.threshold(ganglions.response, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
-    gangl_img = cv2.resize(gangl_img, dsize=(0, 0), fx=19, fy=19, interpolation=cv2.INTER_NEAREST)
-    cv2.imshow('Ganglion', gangl_img)
+    gangl_win.show(ganglions.response)
     cv2.moveWindow('Ganglion', GANGL_WIN_X, GANGL_WIN_Y)
 
     # simple pvcs' response
     for type_ in SIMPLE_PVC_TYPES:
-        ret, simple_pvcs_img = cv2.threshold(simple_pvcs.response[type_], thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
-        simple_pvcs_img = cv2.resize(simple_pvcs_img, dsize=(0, 0), fx=40, fy=40,
-                                     interpolation=cv2.INTER_NEAREST)
-        cv2.imshow(f'{type_}', simple_pvcs_img)
+        simple_pvcs_wins[type_].show(simple_pvcs.response[type_])
 
         if type_ == 'vertical':
             cv2.moveWindow(F'{type_}', PVC_VERTICAL_WIN_X, PVC_VERTICAL_WIN_Y)
@@ -165,9 +205,7 @@ if __name__ == '__main__':
             cv2.moveWindow(F'{type_}', PVC_RIGHT_WIN_X, PVC_RIGHT_WIN_Y)
 
     # borders map
-    ret, borders_map_img = cv2.threshold(borders_map.map, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
-    borders_map_img = cv2.resize(borders_map_img, dsize=(0, 0), fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
-    cv2.imshow('Borders map', borders_map_img)
+    borders_map_win.show(borders_map.map)
     cv2.moveWindow('Borders map', BORDERS_WIN_X, BORDERS_WIN_Y)
 
     cv2.waitKey(1)
@@ -191,42 +229,19 @@ if __name__ == '__main__':
         mech_eye_img = cv2.cvtColor(mech_eye.image_n_frame, code=cv2.COLOR_RGB2BGR)
         mech_eye_img = cv2.resize(mech_eye_img, dsize=(0, 0), fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
         cv2.imshow('Mechanical Eye', mech_eye_img)
-        cv2.moveWindow('Mechanical_Eye', MECH_EYE_WIN_X, MECH_EYE_WIN_Y)
 
         # frame
-        ret, frame_img = cv2.threshold(mech_eye.frame, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
-        frame_img = cv2.resize(frame_img, dsize=(0, 0), fx=11, fy=11, interpolation=cv2.INTER_NEAREST)
-        cv2.imshow('Frame', frame_img)
-        cv2.moveWindow('Frame', FRAME_WIN_X, FRAME_WIN_Y)
+        frame_win.show(mech_eye.frame)
 
         # ganglions' response
-        ret, gangl_img = cv2.threshold(ganglions.response, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
-        gangl_img = cv2.resize(gangl_img, dsize=(0, 0), fx=19, fy=19, interpolation=cv2.INTER_NEAREST)
-        cv2.imshow('Ganglion', gangl_img)
-        cv2.moveWindow('Ganglion', GANGL_WIN_X, GANGL_WIN_Y)
+        gangl_win.show(ganglions.response)
 
         # simple pvcs' response
         for type_ in SIMPLE_PVC_TYPES:
-            ret, simple_pvcs_img = cv2.threshold(simple_pvcs.response[type_], thresh=0.5, maxval=255,
-                                                 type=cv2.THRESH_BINARY)
-            simple_pvcs_img = cv2.resize(simple_pvcs_img, dsize=(0, 0), fx=40, fy=40,
-                                         interpolation=cv2.INTER_NEAREST)
-            cv2.imshow(f'{type_}', simple_pvcs_img)
-
-            if type_ == 'vertical':
-                cv2.moveWindow(F'{type_}', PVC_VERTICAL_WIN_X, PVC_VERTICAL_WIN_Y)
-            elif type_ == 'horizontal':
-                cv2.moveWindow(F'{type_}', PVC_HORIZONTAL_WIN_X, PVC_HORIZONTAL_WIN_Y)
-            elif type_ == 'left_inclined':
-                cv2.moveWindow(F'{type_}', PVC_LEFT_WIN_X, PVC_LEFT_WIN_Y)
-            elif type_ == 'right_inclined':
-                cv2.moveWindow(F'{type_}', PVC_RIGHT_WIN_X, PVC_RIGHT_WIN_Y)
+            simple_pvcs_wins[type_].show(simple_pvcs.response[type_])
 
         # borders map
-        ret, borders_map_img = cv2.threshold(borders_map.map, thresh=0.5, maxval=255, type=cv2.THRESH_BINARY)
-        borders_map_img = cv2.resize(borders_map_img, dsize=(0, 0), fx=2, fy=2, interpolation=cv2.INTER_NEAREST)
-        cv2.imshow('Borders map', borders_map_img)
-        cv2.moveWindow('Borders map', BORDERS_WIN_X, BORDERS_WIN_Y)
+        borders_map_win.show(borders_map.map)
 
         moving_decisions.run()
 
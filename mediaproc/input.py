@@ -1,12 +1,22 @@
 """ Classes for obtaining and preprocessing images and video frames.
 
 """
-from copy import deepcopy
-
 import cv2
 import numpy as np
 
 
+def _read_only_array(values):
+    array = np.array(values)
+    array.flags.writeable = False
+    return array
+
+
+# displacements the eye is usually moved by (one step in any direction)
+_DISPLACEMENTS = {displacement: _read_only_array(displacement)
+                  for displacement in [(0, 0), (0, 1), (0, -1),
+                                       (1, 0), (-1, 0)]}
+
+
 class ImagesGet:
     """ Class for getting visual data from a list of images
 
@@ -15,6 +25,10 @@ class ImagesGet:
         images : array-like object or np.array
             Contains a list of np.ndarray images or one image
 
+        binarize : bool, optional, default True
+            Whether to binarize images (threshold 127). Pass False
+            if images are binary already, with values {0, 1}
+
         Attributes
         ----------
 
@@ -28,26 +42,46 @@ class ImagesGet:
         get_frame() method will continue returning the last image
         of the list.
 
+        Images are binarized into the same uint8 array every time,
+        so a frame is valid until the next call of get_frame().
+        Without binarization the images themselves are returned.
+
     """
 
-    def __init__(self, images):
+    def __init__(self, images, binarize=True):
         self._images = images
         self.n_iter = 0
+        self._binary_frame = None
+        self._binarize = binarize
+
+        if isinstance(images, np.ndarray):
+            self._load_new_frame = self._load_static_frame
+        else:
+            self._load_new_frame = self._load_sequence_frame
 
     def _binarize_frame(self):
         # TODO: smarter binarization
-        ret, self._frame = cv2.threshold(self._frame, thresh=127, maxval=1, type=cv2.THRESH_BINARY)
+        if (self._binary_frame is None) or \
+                (self._binary_frame.shape != self._frame.shape):
+            self._binary_frame = np.empty(self._frame.shape, dtype=np.uint8)
+        np.greater(self._frame, 127, out=self._binary_frame.view(bool))
+        self._frame = self._binary_frame
 
-    def _load_new_frame(self):
+    def _load_static_frame(self):
         self.n_iter += 1
-        if isinstance(self._images, np.ndarray):
-            self._frame = self._images
+        self._frame = self._images
+        if self._binarize:
+            self._binarize_frame()
+
+    def _load_sequence_frame(self):
+        self.n_iter += 1
+        # the sequence may grow while it is read, so its length is not cached
+        if self.n_iter >= len(self._images):
+            self._frame = self._images[-1]
         else:
-            if self.n_iter >= len(self._images):
-                self._frame = self._images[len(self._images)-1]
-            else:
-                self._frame = self._images[self.n_iter-1]
-        self._binarize_frame()
+            self._frame = self._images[self.n_iter-1]
+        if self._binarize:
+            self._binarize_frame()
 
     def get_frame(self):
         """ Get new frame
@@ -84,7 +118,8 @@ class MechanicalEye:
         ----------
         frame : np.ndarray, grayscale image
             A part of an original image corresponding to
-            current position of field of view
+            current position of field of view. The same array
+            is updated on every move
 
         image : np.ndarray
             Binarized original image with pixel's values {0, 1}
@@ -123,24 +158,13 @@ class MechanicalEye:
     def __init__(self, image, field_size):
         self.field_size = field_size
 
-        # copy and binarize image (max 255)
-        self.image = deepcopy(image).astype(dtype=np.uint8)
-        self.image = self._binarize_img(self.image, maxval=255)
-
-        # add white fields to the edges of color_image
-        self.color_image = np.concatenate((np.zeros((1, self.image.shape[0])),
-                                           self.image,
-                                           np.zeros((1, self.image.shape[0]))
-                                           ),
-                                          axis=0
-                                          )
-        self.color_image = np.concatenate((np.zeros((self.image.shape[1] + 2, 1)),
-                                           self.color_image,
-                                           np.zeros((self.image.shape[1] + 2, 1))
-                                           ),
-                                          axis=1
-                                          )
-        self.color_image = self.color_image.astype(dtype=np.uint8)
+        # binarize image (max 255), binarization makes a copy
+        self.image = self._binarize_img(np.asarray(image, dtype=np.uint8),
+                                        maxval=255)
+
+        # add black fields to the edges of color_image
+        self.color_image = cv2.copyMakeBorder(self.image, 1, 1, 1, 1,
+                                              cv2.BORDER_CONSTANT, value=0)
 
         # colorize color_image
         self.color_image = cv2.cvtColor(self.color_image, cv2.COLOR_GRAY2RGB)
@@ -151,8 +175,19 @@ class MechanicalEye:
         # boundaries for center position (both inclusively)
         self.boundaries = [(field_size//2, self.image.shape[0]-1-field_size//2),
                            (field_size//2, self.image.shape[1]-1-field_size//2)]
+        self._center_lower_bound = np.array([bounds[0]
+                                             for bounds in self.boundaries])
+        self._center_upper_bound = np.array([bounds[1]
+                                             for bounds in self.boundaries])
         self.bound_reached = False
 
+        self.frame = np.empty((field_size, field_size), dtype=np.uint8)
+
+        # the visualisation is redrawn in place, only around the field of view
+        self.image_n_frame = self.color_image.copy()
+        self._drawn_region = None
+        self._drawn_color = None
+
         # move field of view to initial position
         self.center_position = None
         self.point1 = None
@@ -194,27 +229,21 @@ class MechanicalEye:
 
         """
         if isinstance(displacement, (tuple, list)):
-            displacement = np.array([int(i) for i in displacement])
+            displacement = tuple(displacement)
+            if displacement in _DISPLACEMENTS:
+                displacement = _DISPLACEMENTS[displacement]
+            else:
+                displacement = np.array([int(i) for i in displacement])
 
         new_center = self.center_position + displacement
 
         # check if trying to move field of view outside the image
-        self.bound_reached = False
-
-        if new_center[0] < self.boundaries[0][0]:
-            new_center[0] = self.boundaries[0][0]
-            self.bound_reached = True
-
-        elif new_center[0] > self.boundaries[0][1]:
-            new_center[0] = self.boundaries[0][1]
-            self.bound_reached = True
-
-        if new_center[1] < self.boundaries[1][0]:
-            new_center[1] = self.boundaries[1][0]
-            self.bound_reached = True
-        elif new_center[1] > self.boundaries[1][1]:
-            new_center[1] = self.boundaries[1][1]
-            self.bound_reached = True
+        center_in_bounds = np.clip(new_center,
+                                   self._center_lower_bound,
+                                   self._center_upper_bound
+                                   )
+        self.bound_reached = bool((center_in_bounds != new_center).any())
+        new_center = center_in_bounds
 
         if self.bound_reached:
             displacement = new_center - self.center_position
@@ -227,9 +256,9 @@ class MechanicalEye:
         self._update_visualisation()
 
     def _update_frame(self):
-        self.frame = self.image[self.point1[0]:self.point2[0] + 1,
-                                self.point1[1]:self.point2[1] + 1
-                                ]
+        np.copyto(self.frame, self.image[self.point1[0]:self.point2[0] + 1,
+                                         self.point1[1]:self.point2[1] + 1
+                                         ])
 
     def _update_visualisation(self):
         if self.bound_reached:
@@ -237,7 +266,20 @@ class MechanicalEye:
         else:
             color = (0, 255, 0)
 
-        self.image_n_frame = deepcopy(self.color_image)
+        region = (slice(self.point1[0], self.point2[0] + 3),
+                  slice(self.point1[1], self.point2[1] + 3))
+
+        # the same rectangle is drawn already
+        if (region == self._drawn_region) and (color == self._drawn_color):
+            return
+
+        # erase the previous rectangle
+        if self._drawn_region is not None:
+            self.image_n_frame[self._drawn_region] = \
+                self.color_image[self._drawn_region]
+
+        self._drawn_region = region
+        self._drawn_color = color
         cv2.rectangle(self.image_n_frame,
                       pt1=tuple(self.point1[::-1]),
                       pt2=tuple(self.point2[::-1] + np.array([2, 2])),
@@ -247,5 +289,4 @@ class MechanicalEye:
 
     @staticmethod
     def _binarize_img(img, maxval):
-        ret, bin_img = cv2.threshold(img, thresh=127, maxval=maxval, type=cv2.THRESH_BINARY)
-        return bin_img
+        return np.multiply(img > 127, maxval, dtype=np.uint8)
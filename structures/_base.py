@@ -2,11 +2,11 @@
 
 """
 
+import functools
 import math
 
 import numpy as np
 import cv2
-import itertools
 
 
 def get_csarf(receptive_field_shape, center_position):
@@ -38,9 +38,52 @@ def get_csarf(receptive_field_shape, center_position):
 
     """
 
+    center_offsets, surround_offsets = \
+        _csarf_offsets(tuple(receptive_field_shape))
+
+    center_input_positions = [
+        tuple(position) for position in center_offsets + center_position
+    ]
+    surround_input_positions = [
+        tuple(position) for position in surround_offsets + center_position
+    ]
+
+    return center_input_positions, surround_input_positions
+
+
+def get_csarf_masks(receptive_field_shape):
+    """ Masks of the center and the surround of CSARF
+
+        Parameters
+        ----------
+        receptive_field_shape : tuple, (center_radius, surround_radius)
+
+        Returns
+        -------
+        csarf_masks : tuple, (center_mask, surround_mask)
+
+        center_mask : numpy.ndarray, float32
+            Square array of side 2*surround_radius+1 with ones at
+            positions of central inputs relative to the receptive field
+
+        surround_mask : numpy.ndarray, float32
+            The same for surrounding inputs
+
+
+    """
+
+    return tuple(
+        mask.copy() for mask in _csarf_masks(tuple(receptive_field_shape))
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _csarf_masks(receptive_field_shape):
+    """ Cached get_csarf_masks(), read-only since the masks are shared
+        between calls
+
+    """
     center_radius, surround_radius = receptive_field_shape
-    center_input_positions = []
-    surround_input_positions = []
 
     fig_center = (surround_radius, surround_radius)
     fig_size = 2*surround_radius+1
@@ -48,120 +91,292 @@ def get_csarf(receptive_field_shape, center_position):
     cv2.circle(fig_csarf, fig_center, surround_radius, -1, -1)
     cv2.circle(fig_csarf, fig_center, center_radius, 1, -1)
 
-    center_position = np.array(center_position)
-
-    for i in range(fig_size):
-        for j in range(fig_size):
-            if fig_csarf[i][j] == 1:
-                # center
-                center_input_positions.append(tuple(
-                    np.array((i, j)) - np.array(fig_center) +
-                    center_position
-                ))
-            elif fig_csarf[i][j] == -1:
-                # surround
-                surround_input_positions.append(tuple(
-                    np.array((i, j)) - np.array(fig_center) +
-                    center_position
-                ))
+    center_mask = (fig_csarf == 1).astype(np.float32)
+    surround_mask = (fig_csarf == -1).astype(np.float32)
 
-    return center_input_positions, surround_input_positions
+    center_mask.flags.writeable = False
+    surround_mask.flags.writeable = False
+    return center_mask, surround_mask
 
 
-def get_simple_pvc_receptive_field(receptive_field_size, center_position, type_):
-    """ Returns receptive field for Simple PVC Cell
+def get_csarf_offsets(receptive_field_shape):
+    """ Positions of the inputs of CSARF relative to its center
+
+        The shape of the receptive field is the same for all cells,
+        only its position differs, so it is stored once as offsets.
+
+        Parameters
+        ----------
+        receptive_field_shape : tuple, (center_radius, surround_radius)
+
+        Returns
+        -------
+        csarf_offsets : tuple, (center_offsets, surround_offsets)
+
+        center_offsets : numpy.ndarray, (n_center_inputs, 2), int32
+            Offsets (row, column) of central inputs
+
+        surround_offsets : numpy.ndarray, (n_surround_inputs, 2), int32
+            Offsets (row, column) of surrounding inputs
 
 
     """
+    return tuple(
+        offsets.copy()
+        for offsets in _csarf_offsets(tuple(receptive_field_shape))
+    )
 
-    size = receptive_field_size
-    on_region_input_positions = []
-    off_region_input_positions = []
 
+@functools.lru_cache(maxsize=None)
+def _csarf_offsets(receptive_field_shape):
+    """ Cached get_csarf_offsets(), read-only since the offsets are shared
+        between calls
+
+    """
+    surround_radius = receptive_field_shape[1]
+    center_mask, surround_mask = _csarf_masks(receptive_field_shape)
+
+    center_offsets = (np.argwhere(center_mask) -
+                      surround_radius).astype(np.int32)
+    surround_offsets = (np.argwhere(surround_mask) -
+                        surround_radius).astype(np.int32)
+
+    center_offsets.flags.writeable = False
+    surround_offsets.flags.writeable = False
+    return center_offsets, surround_offsets
+
+
+# from this side on direct filtering gets slower than DFT correlation
+_DFT_MASK_SIDE = 13
+
+
+def receptive_field_counts(response, mask):
+    """ The number of positive inputs in the receptive fields of all
+        cells of a layer
+
+        The receptive field of the cell (i, j) covers the previous
+        layer's response from (i, j) to (i, j) + mask.shape
+
+        Parameters
+        ----------
+        response : numpy.ndarray, {0, 1}
+            Response of the previous layer
+
+        mask : numpy.ndarray, float32
+            Mask of the receptive field (or of its part), odd sides
+
+        Returns
+        -------
+        counts : numpy.ndarray, int16
+            Array of shape response.shape - mask.shape + 1
+
+
+    """
+    # the response may be a view, e.g. a region of a larger image
+    response = np.ascontiguousarray(response, dtype=np.uint8)
+
+    if max(mask.shape) >= _DFT_MASK_SIDE:
+        # matchTemplate returns just the valid region and correlates
+        # through DFT, the counts are float32 with tiny rounding errors
+        counts = cv2.matchTemplate(response, mask.astype(np.uint8),
+                                   cv2.TM_CCORR)
+        counts += 0.5
+        return counts.astype(np.int16)
+
+    # rounding to int16 keeps the counts exact even if filter2D uses DFT
+    counts = cv2.filter2D(response, cv2.CV_16S, mask,
+                          borderType=cv2.BORDER_CONSTANT)
+
+    row_radius, column_radius = mask.shape[0] // 2, mask.shape[1] // 2
+    return counts[row_radius:counts.shape[0] - row_radius,
+                  column_radius:counts.shape[1] - column_radius]
+
+
+def receptive_field_codes(response, center_mask, surround_mask):
+    """ The numbers of positive center and surround inputs in the
+        receptive fields of all cells of a layer, coded by one number
+
+        The code of a cell is
+        center_count * (n_surround_inputs + 1) + surround_count,
+        a flat index into a table of shape
+        (n_center_inputs + 1, n_surround_inputs + 1).
+        For masks smaller than _DFT_MASK_SIDE both counts are got
+        by one filtering with the mask weighted by these coefficients.
+
+        Parameters
+        ----------
+        response : numpy.ndarray, {0, 1}
+            Response of the previous layer
+
+        center_mask : numpy.ndarray, float32
+            Mask of the center of the receptive field (or of on-region)
+
+        surround_mask : numpy.ndarray, float32
+            Mask of the surround of the receptive field (or of
+            off-region), same shape as center_mask
+
+        Returns
+        -------
+        codes : numpy.ndarray of int
+            Array of shape response.shape - center_mask.shape + 1
+
+
+    """
+    surround_weight = int(surround_mask.sum()) + 1
+
+    if max(center_mask.shape) < _DFT_MASK_SIDE:
+        # at most 11x11 inputs, so the codes are below 61*62 and fit int16
+        return receptive_field_counts(
+            response, center_mask * surround_weight + surround_mask
+        )
+
+    center_count = receptive_field_counts(response, center_mask)
+    surround_count = receptive_field_counts(response, surround_mask)
+    return center_count.astype(np.int32) * surround_weight + surround_count
+
+
+class CenterSurroundLayerBase:
+    """ Base class of layers of cells with Center-surround antagonistic
+        receptive field
+
+        Keeps the parameters shared by all cells of the layer. They are
+        read-only, as the layer builds its response tables from them once.
+
+        Parameters
+        ----------
+        center_surround_tolerance : {'constant', 'linear', 'elliptical'}
+
+        center_threshold : float, [0; 1]
+
+        surround_threshold : float, [0; 1]
+
+    """
+
+    def __init__(self, center_surround_tolerance, center_threshold,
+                 surround_threshold):
+        self._center_surround_tolerance = center_surround_tolerance
+        self._center_threshold = center_threshold
+        self._surround_threshold = surround_threshold
+
+    @property
+    def center_surround_tolerance(self):
+        return self._center_surround_tolerance
+
+    @property
+    def center_threshold(self):
+        return self._center_threshold
+
+    @property
+    def surround_threshold(self):
+        return self._surround_threshold
+
+
+# slopes of the borders between the regions of Simple PVC receptive fields
+_K1 = math.tan(math.radians(27))
+_K2 = math.tan(math.radians(62))
+
+# the range of slopes of the on-region for inclined and horizontal types
+_SIMPLE_PVC_SLOPES = {
+    'horizontal': (-_K1, _K1),
+    'left_inclined': (-_K2, -_K1),
+    'right_inclined': (_K1, _K2)
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _simple_pvc_regions(receptive_field_size, type_):
+    """ Boolean masks (on_region, off_region) of receptive field for
+        Simple PVC Cell, read-only since they are shared between calls
+
+    """
+    size = receptive_field_size
     center = size//2
-    field_center = np.full(2, center)
-    cell_position = np.array(center_position)
 
-    k1 = math.tan(math.radians(27))
-    k2 = math.tan(math.radians(62))
+    rows, columns = np.mgrid[0:size, 0:size]
+    d_row, d_column = center - rows, columns - center
+    on_vertical_axis = d_column == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = d_row / d_column
 
     if type_ == 'vertical':
-        for i in range(size):
-            for j in range(size):
-                if j == center:
-                    on_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-                elif ((center - i) / (j - center) >= k2) or ((center - i) / (j - center) <= -k2):
-                    on_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-                else:
-                    off_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-
-    elif type_ == 'horizontal':
-        for i in range(size):
-            for j in range(size):
-                if j == center:
-                    if i == center:
-                        on_region_input_positions.append(
-                            np.array((i, j)) - field_center +
-                            cell_position
-                        )
-                elif ((center - i) / (j - center) >= -k1) and ((center - i) / (j - center) <= k1):
-                    on_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-                else:
-                    off_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-
-    elif type_ == 'left_inclined':
-        for i in range(size):
-            for j in range(size):
-                if j == center:
-                    if i == center:
-                        on_region_input_positions.append(
-                            np.array((i, j)) - field_center +
-                            cell_position
-                        )
-                elif ((center - i) / (j - center) >= -k2) and ((center - i) / (j - center) <= -k1):
-                    on_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-                else:
-                    off_region_input_positions.append(
-                            np.array((i, j)) - field_center +
-                            cell_position
-                        )
-
-    elif type_ == 'right_inclined':
-        for i in range(size):
-            for j in range(size):
-                if j == center:
-                    if i == center:
-                        on_region_input_positions.append(
-                            np.array((i, j)) - field_center +
-                            cell_position
-                        )
-                elif ((center - i) / (j - center) >= k1) and ((center - i) / (j - center) <= k2):
-                    on_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-                else:
-                    off_region_input_positions.append(
-                        np.array((i, j)) - field_center +
-                        cell_position
-                    )
-
-    return on_region_input_positions, off_region_input_positions
+        on_region = on_vertical_axis | (slope >= _K2) | (slope <= -_K2)
+        off_region = ~on_region
+
+    elif type_ in _SIMPLE_PVC_SLOPES:
+        lower, upper = _SIMPLE_PVC_SLOPES[type_]
+        in_slopes = (slope >= lower) & (slope <= upper)
+        # the vertical axis is left out except for the center
+        on_region = np.where(on_vertical_axis, d_row == 0, in_slopes)
+        off_region = ~(in_slopes | on_vertical_axis)
+
+    else:
+        on_region = off_region = np.zeros((size, size), dtype=bool)
+
+    on_region.flags.writeable = False
+    off_region.flags.writeable = False
+    return on_region, off_region
+
+
+def get_simple_pvc_receptive_field(receptive_field_size, center_position,
+                                   type_):
+    """ Returns receptive field for Simple PVC Cell
+
+        Parameters
+        ----------
+        receptive_field_size : int, must be odd
+
+        center_position : tuple, (row, column)
+            Position of center of receptive field
+
+        type_ : {'vertical', 'horizontal', 'left_inclined', 'right_inclined'}
+
+        Returns
+        -------
+        receptive_field : tuple, (on_region_input_positions,
+                                  off_region_input_positions)
+
+        on_region_input_positions : numpy.ndarray, (n_on_region_inputs, 2),
+                                    int32
+            Positions (row, column) of on-region's inputs
+
+        off_region_input_positions : numpy.ndarray, (n_off_region_inputs, 2),
+                                     int32
+            Positions (row, column) of off-region's inputs
+
+
+    """
+    shift = np.asarray(center_position) - receptive_field_size//2
+
+    return tuple(
+        (np.argwhere(region) + shift).astype(np.int32)
+        for region in _simple_pvc_regions(receptive_field_size, type_)
+    )
+
+
+def get_simple_pvc_receptive_field_masks(receptive_field_size, type_):
+    """ Masks of the on- and off-regions of receptive field
+        for Simple PVC Cell
+
+        Parameters
+        ----------
+        receptive_field_size : int, must be odd
+
+        type_ : {'vertical', 'horizontal', 'left_inclined', 'right_inclined'}
+
+        Returns
+        -------
+        masks : tuple, (on_region_mask, off_region_mask)
+
+        on_region_mask : numpy.ndarray, float32
+            Square array of side receptive_field_size with ones at
+            positions of on-region's inputs relative to the receptive field
+
+        off_region_mask : numpy.ndarray, float32
+            The same for off-region's inputs
+
+
+    """
+    return tuple(
+        region.astype(np.float32)
+        for region in _simple_pvc_regions(receptive_field_size, type_)
+    )
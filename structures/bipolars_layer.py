@@ -3,15 +3,16 @@
 """
 
 
-from copy import deepcopy
-
 import numpy as np
 
 from ..cells.bipolar import BipolarBinaryCell
-from ._base import get_csarf
+from ..cells._base import center_surround_response_table, \
+    center_surround_responses
+from ._base import get_csarf_masks, get_csarf_offsets, \
+    receptive_field_codes, CenterSurroundLayerBase
 
 
-class BipolarsBinaryLayer:
+class BipolarsBinaryLayer(CenterSurroundLayerBase):
     """ Class for layer of binary bipolar cells
         Provides two sublayers: of on-center and off-center cells.
 
@@ -61,6 +62,21 @@ class BipolarsBinaryLayer:
     n_iter : int
         The number of iterations the layer has ran
 
+    center_surround_tolerance : {'constant', 'linear', 'elliptical'}
+        The dependence of the acceptable proportion of positive
+        surround inputs on the proportion of positive center inputs.
+        Read-only
+
+    center_threshold : float, [0; 1]
+        Minimal proportion of positive (or negative for off-center
+        cell's type) center inputs, shared by all cells of the layer.
+        Read-only
+
+    surround_threshold : float, [0; 1]
+        Maximal proportion of positive (or negative for off-center
+        cell's type) surround inputs, shared by all cells of the layer.
+        Read-only
+
     on_cells : list
         2 dimensional array of on-center cells
 
@@ -70,13 +86,17 @@ class BipolarsBinaryLayer:
     input_ : numpy.ndarray
         Layer's input at the last iteration
 
-    response : list of two numpy.ndarray
+    response : list of two numpy.ndarray, int8
         Current response of on- and off-center cells of the layer.
-        On-center cells first.
+        On-center cells first. Both are views of one array of shape
+        (2, row, column).
 
     Notes
     -----
 
+    Responses of all cells are calculated at once by the layer, cells
+    store their responses in the layer's response arrays.
+
     Now this functionality moved to ganglions_layer.py
     Stays here just for keeping some experiments working.
 
@@ -92,6 +112,8 @@ class BipolarsBinaryLayer:
         self._previous_layer = previous_layer
         self._receptive_field_shape = receptive_field_shape
         self._center_radius, self._surround_radius = receptive_field_shape
+        super().__init__(center_surround_tolerance, center_threshold,
+                         surround_threshold)
         self.n_iter = n_iter
 
         self.input_ = None
@@ -99,39 +121,41 @@ class BipolarsBinaryLayer:
             np.array(self._previous_layer.shape) -
             np.full(2, 2 * self._surround_radius)
         )
-        self.response = [np.empty(self.shape, dtype=np.int8) for _ in range(2)]
+        # both sublayers share one buffer, response stays the list
+        # of its two planes old code expects
+        self._response = np.zeros((2,) + self.shape, dtype=np.int8)
+        self.response = list(self._response)
         self.on_cells = []
         self.off_cells = []
-        self._create_cells(center_surround_tolerance,
-                           center_threshold,
-                           surround_threshold)
-
-    def _create_cells(self,
-                      center_surround_tolerance,
-                      center_threshold,
-                      surround_threshold):
+        self._center_mask, self._surround_mask = \
+            get_csarf_masks(receptive_field_shape)
+        self._create_cells()
+
+    def _create_cells(self):
+
+        # the receptive field has the same shape for all cells,
+        # only its position differs; offsets are flattened, so an input
+        # is found by one index into the previous layer's cells
+        n_columns = self._previous_layer.shape[1]
+        center_offsets, surround_offsets = [
+            (offsets[:, 0] * n_columns + offsets[:, 1]).tolist()
+            for offsets in get_csarf_offsets(self._receptive_field_shape)
+        ]
+        input_cells = [cell for cells_row in self._previous_layer.cells
+                       for cell in cells_row]
 
         for i in range(self.shape[0]):
             self.on_cells.append([])
             self.off_cells.append([])
 
             for j in range(self.shape[1]):
-                center_position = tuple(
-                    np.array((i, j)) +
-                    np.full(2, self._surround_radius)
-                )
-
-                center_input_positions, surround_input_positions = \
-                    get_csarf(self._receptive_field_shape,
-                              center_position
-                              )
+                center = (i + self._surround_radius) * n_columns + \
+                    j + self._surround_radius
 
-                input_cells = self._previous_layer.cells
-
-                center_input = [input_cells[row][column]
-                                for row, column in center_input_positions]
-                surround_input = [input_cells[row][column]
-                                  for row, column in surround_input_positions]
+                center_input = [input_cells[center + offset]
+                                for offset in center_offsets]
+                surround_input = [input_cells[center + offset]
+                                  for offset in surround_offsets]
 
                 self.on_cells[i].append(
                     BipolarBinaryCell(
@@ -139,10 +163,11 @@ class BipolarsBinaryLayer:
                         center_type=1,
                         center_input=center_input,
                         surround_input=surround_input,
-                        center_surround_tolerance=center_surround_tolerance,
-                        center_threshold=center_threshold,
-                        surround_threshold=surround_threshold,
-                        n_iter=self.n_iter
+                        center_surround_tolerance=
+                        self.center_surround_tolerance,
+                        n_iter=self.n_iter,
+                        response_buffer=self.response[0],
+                        layer=self
                     )
                 )
                 self.off_cells[i].append(
@@ -151,24 +176,40 @@ class BipolarsBinaryLayer:
                         center_type=-1,
                         center_input=center_input,
                         surround_input=surround_input,
-                        center_surround_tolerance=center_surround_tolerance,
-                        center_threshold=center_threshold,
-                        surround_threshold=surround_threshold,
-                        n_iter=self.n_iter
+                        center_surround_tolerance=
+                        self.center_surround_tolerance,
+                        n_iter=self.n_iter,
+                        response_buffer=self.response[1],
+                        layer=self
                     )
                 )
 
+        # int8 as the responses
+        self._response_tables = [
+            center_surround_response_table(int(self._center_mask.sum()),
+                                           int(self._surround_mask.sum()),
+                                           center_type,
+                                           self.center_surround_tolerance,
+                                           self.center_threshold,
+                                           self.surround_threshold
+                                           ).astype(np.int8)
+            for center_type in (1, -1)
+        ]
+
     def run(self):
         """ Perform one iteration
 
         """
-        self.input_ = deepcopy(self._previous_layer.response)
+        self.input_ = self._previous_layer.response
 
-        for i in range(self.shape[0]):
-            for j in range(self.shape[1]):
-                self.on_cells[i][j].run()
-                self.response[0][i][j] = self.on_cells[i][j].response
-                self.off_cells[i][j].run()
-                self.response[1][i][j] = self.off_cells[i][j].response
+        positive_in_codes = receptive_field_codes(self.input_,
+                                                  self._center_mask,
+                                                  self._surround_mask)
+
+        for response, response_table in zip(self.response,
+                                            self._response_tables):
+            center_surround_responses(positive_in_codes,
+                                      response_table,
+                                      out=response)
 
         self.n_iter += 1
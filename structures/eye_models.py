@@ -3,14 +3,23 @@ Models of human's visual system
 
 """
 
-from copy import deepcopy
-
 from ..mediaproc.input import ImagesGet
 from .photoreceptors_layer import RodsBinaryLayer
 from .ganglions_layer import GanglionsBinaryLayer
 from .pvc_simple_layer import SimplePVCBinaryLayer
 
 
+def _copy_response(response):
+    """ Copy of layer's response: an array, a list or a dict of arrays
+
+    """
+    if isinstance(response, dict):
+        return {key: value.copy() for key, value in response.items()}
+    if isinstance(response, list):
+        return [value.copy() for value in response]
+    return response.copy()
+
+
 class EyeModelAlpha:
     """
     Network's scheme:
@@ -84,10 +93,10 @@ class EyeModelAlpha:
         self.n_iter += 1
 
     def get_input(self):
-        return deepcopy(self.data_get_layer.get_last_frame())
+        return self.data_get_layer.get_last_frame().copy()
 
     def get_ganglion_response(self):
-        return deepcopy(self.ganglions_layer.response)
+        return _copy_response(self.ganglions_layer.response)
 
     def get_pvc_response(self):
-        return deepcopy(self.pvc_layer.response)
+        return _copy_response(self.pvc_layer.response)
@@ -43,7 +43,8 @@ class RodsBinaryLayer:
 
     response: numpy array
         Cells of the layer's current response
-        Array's shape is equal to layer's shape
+        Array's shape is equal to layer's shape.
+        Cells store their responses directly in it.
 
     Notes
     -----
@@ -58,7 +59,7 @@ class RodsBinaryLayer:
         self._data_source = data_source
         self.n_iter = n_iter
         self.input_ = None
-        self.response = np.empty(self.shape, dtype=np.int8)
+        self.response = np.zeros(self.shape, dtype=np.int8)
         self.cells = []
         self._create_cells()
 
@@ -67,10 +68,13 @@ class RodsBinaryLayer:
         for i in range(self.shape[0]):
             self.cells.append([])
             for j in range(self.shape[1]):
-                self.cells[i].append(RodBinaryCell(position=(i, j),
-                                                   n_iter=self.n_iter
-                                                   )
-                                     )
+                self.cells[i].append(
+                    RodBinaryCell(position=(i, j),
+                                  n_iter=self.n_iter,
+                                  response_buffer=self.response,
+                                  layer=self
+                                  )
+                )
 
     def run(self):
         """ Perform one iteration
@@ -79,10 +83,8 @@ class RodsBinaryLayer:
 
         self.input_ = self._data_source.get_frame()
 
-        for i in range(self.shape[0]):
-            for j in range(self.shape[1]):
-                self.cells[i][j].run(self.input_)
-                self.response[i][j] = self.cells[i][j].response
+        # a binary rod's response is its input pixel
+        np.copyto(self.response, self.input_, casting='unsafe')
 
         self.n_iter += 1
 
@@ -121,7 +123,8 @@ class RodsBinaryLayer2:
 
     response: numpy array
         Cells of the layer's current response
-        Array's shape is equal to layer's shape
+        Array's shape is equal to layer's shape.
+        Cells store their responses directly in it.
 
 
     """
@@ -143,10 +146,13 @@ class RodsBinaryLayer2:
         for i in range(self.shape[0]):
             self.cells.append([])
             for j in range(self.shape[1]):
-                self.cells[i].append(RodBinaryCell(position=(i, j),
-                                                   n_iter=self.n_iter
-                                                   )
-                                     )
+                self.cells[i].append(
+                    RodBinaryCell(position=(i, j),
+                                  n_iter=self.n_iter,
+                                  response_buffer=self.response,
+                                  layer=self
+                                  )
+                )
 
     def run(self):
         """ Perform one iteration
@@ -155,9 +161,7 @@ class RodsBinaryLayer2:
 
         self.input_ = self._data_source.frame
 
-        for i in range(self.shape[0]):
-            for j in range(self.shape[1]):
-                self.cells[i][j].run(self.input_)
-                self.response[i][j] = self.cells[i][j].response
+        # a binary rod's response is its input pixel
+        np.copyto(self.response, self.input_, casting='unsafe')
 
         self.n_iter += 1
\ No newline at end of file
@@ -2,13 +2,13 @@
 
 """
 
-import itertools
-
-
 import numpy as np
 
 
-from ._base import get_simple_pvc_receptive_field
+from ._base import get_simple_pvc_receptive_field, \
+    get_simple_pvc_receptive_field_masks, receptive_field_codes
+from ..cells._base import center_surround_response_table, \
+    center_surround_responses
 from ..cells.pvc import SimplePVCBinaryCell, SimplePVCBinaryCell2
 
 
@@ -85,6 +85,9 @@ class SimplePVCBinaryLayer:
 
     Notes
     -----
+    Responses of all cells are calculated at once by the layer, cells
+    store their responses in the layer's response arrays.
+
     The functionality is moved to SimplePVCBinaryLayer2
     Stays here just for keeping some old code working.
 
@@ -109,10 +112,12 @@ class SimplePVCBinaryLayer:
             np.array(self._previous_layer.shape) -
             np.full(2, self._receptive_field_size - 1)
         )
-        self.response = {type_: np.empty(self.shape, dtype=np.int8)
+        self.response = {type_: np.zeros(self.shape, dtype=np.int8)
                          for type_ in SIMPLE_PVC_TYPES}
 
         self.cells = {type_: [] for type_ in SIMPLE_PVC_TYPES}
+        self._masks = {}
+        self._response_tables = {}
         self._create_cells(regions_tolerance,
                            on_region_threshold,
                            off_region_threshold
@@ -123,57 +128,53 @@ class SimplePVCBinaryLayer:
                       on_region_threshold,
                       off_region_threshold
                       ):
+        # offsets are flattened, so an input is found by one index
+        # into the previous layer's cells
+        n_columns = self._previous_layer.shape[1]
+        on_cells = [cell for cells_row in self._previous_layer.on_cells
+                    for cell in cells_row]
+        off_cells = [cell for cells_row in self._previous_layer.off_cells
+                     for cell in cells_row]
+        if self._input_sublayer_type == 'on-center':
+            input_sublayers = [on_cells]
+        elif self._input_sublayer_type == 'off-center':
+            input_sublayers = [off_cells]
+        elif self._input_sublayer_type == 'both':
+            input_sublayers = [on_cells, off_cells]
+
         for type_ in self.cells.keys():
 
+            # the receptive field has the same shape for all cells,
+            # only its position differs
+            on_region_offsets, off_region_offsets = [
+                (positions[:, 0] * n_columns + positions[:, 1]).tolist()
+                for positions in get_simple_pvc_receptive_field(
+                    self._receptive_field_size,
+                    (self._receptive_field_size//2,) * 2,
+                    type_
+                )
+            ]
+
             for i in range(self.shape[0]):
                 self.cells[type_].append([])
 
                 for j in range(self.shape[1]):
-                    center_position = tuple(
-                        np.array((i, j)) +
-                        np.full(2, self._receptive_field_size//2)
-                    )
-
-                    on_region_input_positions, off_region_input_positions = \
-                        get_simple_pvc_receptive_field(self._receptive_field_size,
-                                                       center_position,
-                                                       type_
-                                                       )
-
-                    if self._input_sublayer_type == 'on-center':
-                        on_region_input = [self._previous_layer.on_cells[i][j]
-                                           for i, j in on_region_input_positions]
-                        off_region_input = [self._previous_layer.on_cells[i][j]
-                                            for i, j in off_region_input_positions]
-
-                    elif self._input_sublayer_type == 'off-center':
-                        on_region_input = [self._previous_layer.off_cells[i][j]
-                                           for i, j in on_region_input_positions]
-                        off_region_input = [self._previous_layer.off_cells[i][j]
-                                            for i, j in off_region_input_positions]
-
-                    elif self._input_sublayer_type == 'both':
-                        on_region_input = []
-                        off_region_input = []
-
-                        # on-cells
-                        on_region_input.append(
-                            [self._previous_layer.on_cells[i][j]
-                            for i, j in on_region_input_positions]
-                        )
-                        off_region_input.append(
-                            [self._previous_layer.on_cells[i][j]
-                            for i, j in off_region_input_positions]
-                        )
-                        # off-cells
-                        on_region_input.append(
-                            [self._previous_layer.off_cells[i][j]
-                             for i, j in on_region_input_positions]
-                        )
-                        off_region_input.append(
-                            [self._previous_layer.off_cells[i][j]
-                             for i, j in off_region_input_positions]
-                        )
+                    corner = i * n_columns + j
+
+                    on_region_input = [
+                        [input_cells[corner + offset]
+                         for offset in on_region_offsets]
+                        for input_cells in input_sublayers
+                    ]
+                    off_region_input = [
+                        [input_cells[corner + offset]
+                         for offset in off_region_offsets]
+                        for input_cells in input_sublayers
+                    ]
+                    # with one sublayer at the input the inputs are not nested
+                    if self._input_sublayer_type != 'both':
+                        on_region_input, = on_region_input
+                        off_region_input, = off_region_input
 
                     self.cells[type_][i].append(
                         SimplePVCBinaryCell(
@@ -184,10 +185,25 @@ class SimplePVCBinaryLayer:
                             regions_tolerance=regions_tolerance,
                             on_region_threshold=on_region_threshold,
                             off_region_threshold=off_region_threshold,
-                            n_iter=self.n_iter
+                            n_iter=self.n_iter,
+                            response_buffer=self.response[type_],
+                            layer=self
                         )
                     )
 
+            self._masks[type_] = get_simple_pvc_receptive_field_masks(
+                self._receptive_field_size, type_)
+            # the on-region works like the center of a cell with on-center,
+            # the off-region - like its surround; int8 as the responses
+            self._response_tables[type_] = center_surround_response_table(
+                int(self._masks[type_][0].sum()),
+                int(self._masks[type_][1].sum()),
+                1,
+                regions_tolerance,
+                on_region_threshold,
+                off_region_threshold
+            ).astype(np.int8)
+
     def run(self):
         """ Perform one iteration
 
@@ -195,11 +211,35 @@ class SimplePVCBinaryLayer:
 
         self.input_ = self._previous_layer.response
 
+        if self._input_sublayer_type == 'on-center':
+            inputs = [self.input_[0]]
+        elif self._input_sublayer_type == 'off-center':
+            inputs = [self.input_[1]]
+        elif self._input_sublayer_type == 'both':
+            inputs = self.input_
+
+        first_input, *other_inputs = inputs
+
         for type_ in self.cells.keys():
-            for i, j in itertools.product(range(self.shape[0]),
-                                          range(self.shape[1])):
-                self.cells[type_][i][j].run()
-                self.response[type_][i][j] = self.cells[type_][i][j].response
+            on_region_mask, off_region_mask = self._masks[type_]
+            response = self.response[type_]
+
+            center_surround_responses(
+                receptive_field_codes(first_input,
+                                      on_region_mask,
+                                      off_region_mask),
+                self._response_tables[type_],
+                out=response
+            )
+            # with both sublayers at the input a cell responses positively
+            # only if it does so for each of them
+            for input_ in other_inputs:
+                response &= center_surround_responses(
+                    receptive_field_codes(input_,
+                                          on_region_mask,
+                                          off_region_mask),
+                    self._response_tables[type_]
+                )
 
         self.n_iter += 1
 
@@ -264,6 +304,8 @@ class SimplePVCBinaryLayer2:
     Notes
     -----
 
+    Responses of all cells are calculated at once by the layer, cells
+    store their responses in the layer's response arrays.
 
     """
 
@@ -288,6 +330,8 @@ class SimplePVCBinaryLayer2:
                          for type_ in SIMPLE_PVC_TYPES}
 
         self.cells = {type_: [] for type_ in SIMPLE_PVC_TYPES}
+        self._masks = {}
+        self._response_tables = {}
         self._create_cells(regions_tolerance,
                            on_region_threshold,
                            off_region_threshold
@@ -298,27 +342,35 @@ class SimplePVCBinaryLayer2:
                       on_region_threshold,
                       off_region_threshold
                       ):
+        # offsets are flattened, so an input is found by one index
+        # into the previous layer's cells
+        n_columns = self._previous_layer.shape[1]
+        input_cells = [cell for cells_row in self._previous_layer.cells
+                       for cell in cells_row]
+
         for type_ in self.cells.keys():
 
+            # the receptive field has the same shape for all cells,
+            # only its position differs
+            on_region_offsets, off_region_offsets = [
+                (positions[:, 0] * n_columns + positions[:, 1]).tolist()
+                for positions in get_simple_pvc_receptive_field(
+                    self._receptive_field_size,
+                    (self._receptive_field_size//2,) * 2,
+                    type_
+                )
+            ]
+
             for i in range(self.shape[0]):
                 self.cells[type_].append([])
 
                 for j in range(self.shape[1]):
-                    center_position = tuple(
-                        np.array((i, j)) +
-                        np.full(2, self._receptive_field_size//2)
-                    )
-
-                    on_region_input_positions, off_region_input_positions = \
-                        get_simple_pvc_receptive_field(self._receptive_field_size,
-                                                       center_position,
-                                                       type_
-                                                       )
+                    corner = i * n_columns + j
 
-                    on_region_input = [self._previous_layer.cells[i][j]
-                                       for i, j in on_region_input_positions]
-                    off_region_input = [self._previous_layer.cells[i][j]
-                                        for i, j in off_region_input_positions]
+                    on_region_input = [input_cells[corner + offset]
+                                       for offset in on_region_offsets]
+                    off_region_input = [input_cells[corner + offset]
+                                        for offset in off_region_offsets]
 
                     self.cells[type_][i].append(
                         SimplePVCBinaryCell2(
@@ -328,10 +380,25 @@ class SimplePVCBinaryLayer2:
                             regions_tolerance=regions_tolerance,
                             on_region_threshold=on_region_threshold,
                             off_region_threshold=off_region_threshold,
-                            n_iter=self.n_iter
+                            n_iter=self.n_iter,
+                            response_buffer=self.response[type_],
+                            layer=self
                         )
                     )
 
+            self._masks[type_] = get_simple_pvc_receptive_field_masks(
+                self._receptive_field_size, type_)
+            # the on-region works like the center of a cell with on-center,
+            # the off-region - like its surround
+            self._response_tables[type_] = center_surround_response_table(
+                int(self._masks[type_][0].sum()),
+                int(self._masks[type_][1].sum()),
+                1,
+                regions_tolerance,
+                on_region_threshold,
+                off_region_threshold
+            )
+
     def run(self):
         """ Perform one iteration
 
@@ -340,9 +407,14 @@ class SimplePVCBinaryLayer2:
         self.input_ = self._previous_layer.response
 
         for type_ in self.cells.keys():
-            for i in range(self.shape[0]):
-                for j in range(self.shape[1]):
-                    self.cells[type_][i][j].run()
-                    self.response[type_][i][j] = self.cells[type_][i][j].response
+            on_region_mask, off_region_mask = self._masks[type_]
+
+            center_surround_responses(
+                receptive_field_codes(self.input_,
+                                      on_region_mask,
+                                      off_region_mask),
+                self._response_tables[type_],
+                out=self.response[type_]
+            )
 
         self.n_iter += 1